@@ -12,15 +12,22 @@ Classes:
     HBNBCommand: A command-line parser class for interactive use.
 """
 
+import ast
 import cmd
 import importlib
 import os
 import re
 from datetime import datetime
 from types import ModuleType
+from typing import TYPE_CHECKING
 
-from models.base_model import BaseModel
-from models.engine.file_storage import FileStorage
+import models
+
+if TYPE_CHECKING:
+    from models.base_model import BaseModel
+
+_DOT_CALL = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)\.([A-Za-z_][A-Za-z0-9_]*)'
+                       r'\((.*)\)\s*$')
 
 
 class HBNBUtils:
@@ -43,7 +50,7 @@ class HBNBService:
     A service class to manage creation, updates, and deletions of entities.
     """
 
-    storage = FileStorage()
+    storage = models.storage
 
     def create(self, clazz: str):
         """
@@ -73,12 +80,35 @@ class HBNBService:
             attr (str): The attribute to update.
             value (str): The new value for the attribute.
         """
+        return self.update_model_attributes(model, id, {attr: value})
+
+    def update_model_attributes(self, model, id, attrs):
+        """
+        Update several attributes of a model and persist them once.
+
+        Args:
+            model (str): The entity's class name.
+            id (str): The entity's ID.
+            attrs (dict): Mapping of attribute names to their new values.
+        """
         module = self.__get_module(model)
         if module is not None and hasattr(module, model):
             key = '.'.join([model, id])
-            instance: BaseModel = self.storage.all().get(key, None)
+            instance: 'BaseModel' = self.storage.all().get(key, None)
             if instance is not None:
-                instance.__setattr__(attr, value)
+                from models.base_model import ReadOnlyAttributeError
+
+                try:
+                    attrs = {attr: instance.coerce(attr, value)
+                             for (attr, value) in attrs.items()}
+                except ReadOnlyAttributeError:
+                    print("** attribute can't be updated **")
+                    return None
+                except ValueError:
+                    print('** invalid value **')
+                    return None
+                for (attr, value) in attrs.items():
+                    instance.__setattr__(attr, value)
                 instance.updated_at = datetime.now()
                 self.storage.all()[key] = instance
                 self.storage.save()
@@ -225,102 +255,114 @@ class HBNBCommand(cmd.Cmd):
 
     def do_create(self, *args):
         """Create a new model"""
-        _args = (str(args[0]).split(' '))
-        if len(_args) < 1 or args[0] == '':
+        return self.__create(str(args[0]).split(' '))
+
+    def do_update(self, *args):
+        """Update model data"""
+        _args = (str(args[0]).split(' ', 2))
+        if len(_args) == 3 and _args[2].startswith('{'):
+            _attrs = self.parse_dict(_args[2])
+            if _attrs is not None:
+                return self.__update([self.remove_quotes(x)
+                                      for x in _args[:2]] + [_attrs])
+        return self.__update([self.remove_quotes(x)
+                              for x in str(args[0]).split(' ')])
+
+    def do_destroy(self, *args):
+        """Remove a model by id"""
+        return self.__destroy(str(args[0]).split(' '))
+
+    def do_all(self, *args):
+        """Lists all models of a class"""
+        return self.__all(str(args[0]).split(' '))
+
+    def do_count(self, *args):
+        """Prints the size of a model type"""
+        return self.__count(str(args[0]).split(' '))
+
+    def do_show(self, *args):
+        """Prints a model instance"""
+        return self.__show(str(args[0]).split(' '))
+
+    def __create(self, args):
+        if len(args) < 1 or args[0] == '':
             print('** class name missing **')
             return
-        _id = self.bnbService.create(_args[0])
+        _id = self.bnbService.create(args[0])
         if _id is not None:
             print(_id)
-            return
 
-    def do_update(self, *args):
-        """Update model data"""
-        _args = (str(args[0]).split(' '))
-        _model, _attr, _id, _value = list([str()] * 4)
-        try:
-            _model = _args[0]
-            _id = _args[1]
-            _attr = _args[2]
-            _value = _args[3]
-        except (ValueError, IndexError):
-            if _model is None or len(_model) == 0:
-                print('** class name missing **')
-                return
-            if _id is None or len(_id) == 0:
-                print('** instance id missing **')
-                return
-            if _attr is None or len(_attr) == 0:
+    def __update(self, args):
+        _model = args[0] if len(args) > 0 else ''
+        _id = str(args[1]) if len(args) > 1 else ''
+        if len(_model) == 0:
+            print('** class name missing **')
+            return
+        if len(_id) == 0:
+            print('** instance id missing **')
+            return
+        if len(args) > 2 and isinstance(args[2], dict):
+            result = self.bnbService.update_model_attributes(_model, _id,
+                                                             args[2])
+        else:
+            _attr = str(args[2]) if len(args) > 2 else ''
+            if len(_attr) == 0:
                 print('** attribute name missing **')
                 return
-            if _value is None or len(_value) == 0:
+            if len(args) < 4 or args[3] == '':
                 print('** value missing **')
                 return
-
-        result = self.bnbService.update_model_attribute(_model, _id,
-                                                        _attr, _value)
-
+            result = self.bnbService.update_model_attribute(_model, _id,
+                                                            _attr, args[3])
         if result is not None:
             print(result)
+
+    def __destroy(self, args):
+        _model = args[0] if len(args) > 0 else ''
+        _id = str(args[1]) if len(args) > 1 else ''
+        if len(_model) == 0:
+            print('** class name missing **')
             return
-        else:
+        if len(_id) == 0:
+            print('** instance id missing **')
             return
-
-    def do_destroy(self, *args):
-        """Remove a model by id"""
-        _args = (str(args[0]).split(' '))
-        _model = ''
-        _id = ''
-        try:
-            _model = _args[0]
-            _id = _args[1]
-        except (ValueError, IndexError):
-            if len(_model) == 0:
-                print('** class name missing **')
-                return
-            if _id is None or len(_id) == 0:
-                print('** instance id missing **')
-                return
-
         return self.bnbService.delete_model_by_id(_model, _id)
 
-    def do_all(self, *args):
-        """Lists all models of a class"""
-        _args = args[0].split(' ')
-        result = self.bnbService.fetch_all(_args[0])
+    def __all(self, args):
+        result = self.bnbService.fetch_all(args[0] if len(args) > 0 else '')
         if result is not None and len(result) > 0:
             print(result)
 
-    def do_count(self, *args):
-        """Prints the size of a model type"""
-        _args = args[0].split(' ')
-        if len(_args) < 1:
+    def __count(self, args):
+        if len(args) < 1:
             print('** class name missing **')
-
-        _count = self.bnbService.fetch_model_count(_args[0])
+            return
+        _count = self.bnbService.fetch_model_count(args[0])
         if _count is not None:
             print(_count)
 
-    def do_show(self, *args):
-        """Prints a model instance"""
-        _args = (str(args[0]).split(' '))
-        _model = ''
-        _id = ''
-        try:
-            _model = _args[0]
-            _id = _args[1]
-        except (ValueError, IndexError):
-            if len(_model) == 0:
-                print('** class name missing **')
-                return
-            if _id is None or len(_id) == 0:
-                print('** instance id missing **')
-                return
-
+    def __show(self, args):
+        _model = args[0] if len(args) > 0 else ''
+        _id = str(args[1]) if len(args) > 1 else ''
+        if len(_model) == 0:
+            print('** class name missing **')
+            return
+        if len(_id) == 0:
+            print('** instance id missing **')
+            return
         result = self.bnbService.fetch_model_by_id(_model, _id)
         if result is not None:
             print(result)
 
+    __dispatch = {
+        'create': __create,
+        'update': __update,
+        'destroy': __destroy,
+        'all': __all,
+        'count': __count,
+        'show': __show
+    }
+
     def cmdloop(self, intro=None):
         super().cmdloop(intro)
 
@@ -332,28 +374,17 @@ class HBNBCommand(cmd.Cmd):
             self.prompt = ''
             self.onecmd('')
 
-    def precmd(self, line: str):
+    def default(self, line: str):
+        """Dispatches `<class>.<method>(<args>)` calls with their parsed
+        arguments"""
         try:
-            _fn = 'do_' + line.split(' ')[0]
-            if getattr(self, _fn) is not None:
-                return super().precmd(line)
-        except (AttributeError):
-            try:
-                ln = self.preprocess_input(line)
-                return super().precmd(ln)
-            except (AttributeError, TypeError, ValueError, IndexError):
-                return super().precmd(line)
-
-        return super().precmd(line)
-
-    def preprocess_input(self, line: str):
-        args = [self.remove_quotes(x)
-                for x in self.tokenize_string(line)]
-        _entity = args[0]
-        _method = args[1]
-        _args = args[2:]
-        if getattr(self, 'do_' + _method) is not None:
-            return ' '.join([_method, _entity] + _args)
+            tokens = self.tokenize_string(line)
+        except (ValueError, SyntaxError):
+            tokens = None
+        if tokens is not None and tokens[1] in HBNBCommand.__dispatch:
+            return HBNBCommand.__dispatch[tokens[1]](self,
+                                                     tokens[:1] + tokens[2:])
+        return super().default(line)
 
     def remove_quotes(self, input: str):
         if input.startswith(('"', "'")) and input.endswith(('"', "'")):
@@ -363,19 +394,52 @@ class HBNBCommand(cmd.Cmd):
 
     def tokenize_string(self, input_string):
         if input_string is None or len(input_string) == 0:
-            return ['']
-        pattern = r'([A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*)\.([A \
-        -Za-z_][A-Za-z0-9_]*)\(([^)]*)\)'
-
-        match = re.match(pattern, input_string)
+            return None
+        match = _DOT_CALL.match(input_string)
         if match:
             class_name = match.group(1)
-            method_name = match.group(3)
-            args = [arg.strip() for arg in match.group(4).split(',')]
+            method_name = match.group(2)
+            args = self.split_arguments(match.group(3))
             return [class_name, method_name] + args
 
         return None
 
+    def split_arguments(self, args: str):
+        """Splits a call's argument list in a single pass.
+
+        Arguments are evaluated as Python literals so quoted strings may
+        contain commas and spaces and a dictionary may be passed as a single
+        argument. A leading bare word such as an unquoted id is taken as is
+        and the rest evaluated. Otherwise bare words fall back to a plain
+        comma split, and ValueError is raised when that would cut a quoted
+        string, list or dictionary apart.
+        """
+        if len(args.strip()) == 0:
+            return []
+        try:
+            return list(ast.literal_eval('(' + args + ',)'))
+        except (ValueError, SyntaxError):
+            pass
+        (head, _, rest) = args.partition(',')
+        try:
+            values = ast.literal_eval('(' + rest + ',)') if rest.strip() \
+                else ()
+            return [self.remove_quotes(head.strip())] + list(values)
+        except (ValueError, SyntaxError):
+            pass
+        pieces = [self.remove_quotes(arg.strip()) for arg in args.split(',')]
+        if any(c in piece for piece in pieces for c in '{}[]"\''):
+            raise ValueError('invalid arguments: ' + args)
+        return pieces
+
+    def parse_dict(self, input: str):
+        """Returns the dictionary literal in `input`, or None"""
+        try:
+            value = ast.literal_eval(input)
+        except (ValueError, SyntaxError):
+            return None
+        return value if isinstance(value, dict) else None
+
 
 if __name__ == '__main__':
     HBNBCommand().cmdloop()
@@ -1,6 +1,21 @@
 #!/usr/bin/env python3
-"""The initialization module"""
+"""The initialization module
 
-import models.engine.file_storage as s
-storage = s.FileStorage()
-storage.reload()
+The storage reads its data on first use rather than at import.
+Set HBNB_STORAGE=cache to keep objects on disk in SQLite and only the
+HBNB_CACHE_SIZE most recently used ones in memory.
+Set HBNB_CHANGE_FEED=1 to log saved changes to file.json.log and apply
+the ones saved by other processes instead of reloading file.json.
+"""
+import os
+
+if os.getenv("HBNB_STORAGE") == "cache":
+    from models.engine.cached_storage import CachedStorage
+    storage = CachedStorage(
+        max_objects=int(os.getenv("HBNB_CACHE_SIZE", "1024")))
+else:
+    import models.engine.file_storage as s
+    storage = s.FileStorage()
+    if os.getenv("HBNB_CHANGE_FEED"):
+        from models.engine.change_feed import ChangeFeed
+        storage.follow(ChangeFeed("file.json.log"))
@@ -1,10 +1,54 @@
 #!/usr/bin/env python3
 """A module that defines the BaseModel Class"""
+import ast
 import uuid
 from datetime import datetime
 from models import storage
 
 
+def _to_list(value):
+    """casts a list or its string representation to a list"""
+    if isinstance(value, str):
+        value = ast.literal_eval(value) if value.strip() else []
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f"{value!r} is not a list")
+    return list(value)
+
+
+def _to_int(value):
+    """casts an integer, an integral float or a numeric string to an int"""
+    if isinstance(value, bool):
+        raise ValueError(f"{value!r} is not an int")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"{value!r} is not an int")
+        return int(value)
+    if not isinstance(value, (int, str)):
+        raise ValueError(f"{value!r} is not an int")
+    return int(value)
+
+
+def _to_float(value):
+    """casts a number or a numeric string to a float"""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{value!r} is not a float")
+    return float(value)
+
+
+def _to_str(value):
+    """keeps string attributes as given, so None or other stored values
+    are not turned into text"""
+    return value
+
+
+_COERCERS = {str: _to_str, int: _to_int, float: _to_float, list: _to_list}
+_READ_ONLY = frozenset(("id", "created_at", "updated_at", "__class__"))
+
+
+class ReadOnlyAttributeError(ValueError):
+    """Raised when updating an attribute managed by the model"""
+
+
 class BaseModel():
     """The baseModel class"""
 
@@ -16,12 +60,19 @@ class BaseModel():
             self.updated_at = datetime.now()
             storage.new(self)
         else:
-            self.id = kwargs.get("id", str(uuid.uuid4()))
+            attributes = {"id": kwargs.get("id", str(uuid.uuid4()))}
             for (key, value) in kwargs.items():
                 if key == "created_at" or key == "updated_at":
-                    setattr(self, key, datetime.fromisoformat(value))
+                    attributes[key] = datetime.fromisoformat(value)
                 elif key != "__class__":
-                    setattr(self, key, value)
+                    attributes[key] = value
+            self.__dict__.update(attributes)
+
+    def __setattr__(self, key, value):
+        """sets an attribute, keeping the storage indexes up to date"""
+        old = self.__dict__.get(key, getattr(type(self), key, None))
+        super().__setattr__(key, value)
+        storage.reindex(self, key, old, value)
 
     def __str__(self):
         """custom str function"""
@@ -30,8 +81,52 @@ class BaseModel():
     def save(self):
         "updates 'updated_at' with current datetime"
         self.updated_at = datetime.now()
+        storage.attach(self)
         storage.save()
 
+    @classmethod
+    def schema(cls):
+        """returns the attribute coercers declared by the class, built once"""
+        if "_schema" not in cls.__dict__:
+            schema = {}
+            for klass in reversed(cls.__mro__):
+                for (key, value) in vars(klass).items():
+                    if not key.startswith("_") and type(value) in _COERCERS:
+                        schema[key] = _COERCERS[type(value)]
+            cls._schema = schema
+        return cls._schema
+
+    @classmethod
+    def coerce(cls, key, value):
+        """casts value to the declared type of attribute key, refusing
+        the attributes managed by the model and its relationships"""
+        if key in _READ_ONLY or isinstance(getattr(cls, key, None), property):
+            raise ReadOnlyAttributeError(f"{key} is read-only")
+        coercer = cls.schema().get(key)
+        if coercer is None:
+            return value
+        try:
+            return coercer(value)
+        except (TypeError, ValueError, SyntaxError) as e:
+            raise ValueError(f"invalid value for {key}: {value!r}") from e
+
+    @classmethod
+    def coerce_batch(cls, records):
+        """casts the declared attributes of a list of dictionaries in place
+
+        Values that cannot be cast are kept as they are so loading never
+        drops stored data.
+        """
+        schema = cls.schema()
+        for (key, coercer) in schema.items():
+            for record in records:
+                if key in record:
+                    try:
+                        record[key] = coercer(record[key])
+                    except (TypeError, ValueError, SyntaxError):
+                        pass
+        return records
+
     def to_dict(self):
         """returns a dictionary containing all keys/values of __dict__"""
         result = {}
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Module that defines a class `City`"""
+from models import storage
 from models.base_model import BaseModel
 
 
@@ -7,3 +8,8 @@ class City(BaseModel):
     """City class inheriting from the Base Model"""
     state_id = ""
     name = ""
+
+    @property
+    def places(self):
+        """returns the places in this city"""
+        return storage.related("Place", "city_id", self.id)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""A module that defines a disk-resident storage class with an LRU cache"""
+import json
+import sqlite3
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from models.engine.file_storage import classes
+
+
+class _Objects(MutableMapping):
+    """dictionary view of a CachedStorage, as returned by `all`"""
+
+    def __init__(self, storage):
+        self.__storage = storage
+
+    def __getitem__(self, key):
+        obj = self.__storage.get(key)
+        if obj is None:
+            raise KeyError(key)
+        return obj
+
+    def __setitem__(self, key, obj):
+        self.__storage.put(key, obj)
+
+    def __delitem__(self, key):
+        if not self.__storage.delete(key):
+            raise KeyError(key)
+
+    def __iter__(self):
+        return self.__storage.keys()
+
+    def __len__(self):
+        return self.__storage.count()
+
+
+class CachedStorage():
+    """Storage class keeping objects in SQLite and only the most recently
+    used ones in memory
+
+    Attributes:
+        max_objects (int): The number of hydrated objects to keep.
+        max_bytes (int): The serialized size of hydrated objects to keep,
+        or None for no limit.
+    """
+    __page_size = 512
+
+    def __init__(self, file_path="file.db", max_objects=1024,
+                 max_bytes=None):
+        self.__file_path = file_path
+        self.max_objects = max_objects
+        self.max_bytes = max_bytes
+        self.__connection = None
+        self.__cache = OrderedDict()
+        self.__snapshots = {}
+        self.__sizes = {}
+        self.__bytes = 0
+        self.__indexes = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def all(self):
+        """returns a dictionary view of every stored object"""
+        return _Objects(self)
+
+    def new(self, obj):
+        """adds new data to the cache, to be written on save or eviction"""
+        self.put(f"{obj.__class__.__name__}.{obj.id}", obj)
+
+    def reindex(self, obj, attr, old, value):
+        """nothing to do, prefetch flushes and queries current values"""
+
+    def attach(self, obj):
+        """caches obj again as a changed object if it was evicted, so its
+        changes are written on save, deleted objects are left out"""
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        cached = self.__cache.get(key)
+        if cached is obj:
+            return
+        if cached is not None or self.__db().execute(
+                "SELECT 1 FROM objects WHERE key = ?", (key,)).fetchone():
+            self.put(key, obj)
+
+    def save(self):
+        """writes every changed cached object to disk"""
+        self.__flush()
+        self.__trim()
+        self.__db().commit()
+
+    def reload(self):
+        """drops the cache so objects are read again from disk"""
+        self.__cache.clear()
+        self.__snapshots.clear()
+        self.__sizes.clear()
+        self.__bytes = 0
+        self.__db()
+
+    def snapshot(self, path, codec="gzip", level=None, base=None):
+        """writes the objects to a compressed snapshot file, see
+        FileStorage.snapshot"""
+        from models.engine import snapshot
+        snapshot.dump(self.all(), path, codec, level, base)
+
+    def restore(self, paths):
+        """replaces the objects by the ones in a full snapshot followed by
+        differential snapshots, then saves them"""
+        from models.engine import snapshot
+        result = snapshot.load(paths)
+        self.reload()
+        self.__db().execute("DELETE FROM objects")
+        class_map = classes()
+        for (key, value) in result.items():
+            clazz = class_map[value["__class__"]]
+            clazz.coerce_batch([value])
+            self.put(key, clazz(**value))
+        self.save()
+
+    def stats(self):
+        """returns the cache counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "objects": len(self.__cache),
+            "bytes": self.__bytes
+        }
+
+    def get(self, key):
+        """returns the object stored under key, or None"""
+        obj = self.__cache.get(key)
+        if obj is not None:
+            self.hits += 1
+            self.__cache.move_to_end(key)
+            return obj
+        self.misses += 1
+        row = self.__db().execute(
+            "SELECT data FROM objects WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value = json.loads(row[0])
+        clazz = classes()[value["__class__"]]
+        clazz.coerce_batch([value])
+        obj = clazz(**value)
+        self.__insert(key, obj, row[0])
+        return obj
+
+    def put(self, key, obj):
+        """caches obj under key as a changed object"""
+        self.__discard(key)
+        self.__insert(key, obj, None)
+
+    def delete(self, key):
+        """removes the object stored under key, returns whether it existed"""
+        cached = self.__discard(key) is not None
+        cursor = self.__db().execute(
+            "DELETE FROM objects WHERE key = ?", (key,))
+        return cached or cursor.rowcount > 0
+
+    def keys(self):
+        """yields every stored key, reading the table a page at a time"""
+        self.__flush()
+        last = ""
+        while True:
+            rows = self.__db().execute(
+                "SELECT key FROM objects WHERE key > ? ORDER BY key LIMIT ?",
+                (last, CachedStorage.__page_size)).fetchall()
+            for (key,) in rows:
+                yield key
+            if len(rows) < CachedStorage.__page_size:
+                return
+            last = rows[-1][0]
+
+    def count(self):
+        """returns the number of stored objects"""
+        self.__flush()
+        return self.__db().execute(
+            "SELECT COUNT(*) FROM objects").fetchone()[0]
+
+    def related(self, class_name, attr, _id):
+        """returns objects of class_name whose attr references _id"""
+        return self.prefetch([_id], class_name, attr)[_id]
+
+    def prefetch(self, parents, class_name, attr):
+        """maps each parent (an object or id) to the objects of class_name
+        whose attr references it, resolving all of them in one query"""
+        if not attr.isidentifier():
+            raise ValueError(f"invalid attribute name: {attr}")
+        self.__flush()
+        expression = f"json_extract(data, '$.{attr}')"
+        if attr not in self.__indexes:
+            self.__db().execute(
+                f"CREATE INDEX IF NOT EXISTS objects_{attr} "
+                f"ON objects(class, {expression})")
+            self.__indexes.add(attr)
+        ids = [getattr(parent, "id", parent) for parent in parents]
+        result = {_id: [] for _id in ids}
+        for start in range(0, len(ids), CachedStorage.__page_size):
+            page = ids[start:start + CachedStorage.__page_size]
+            rows = self.__db().execute(
+                f"SELECT key, {expression} FROM objects WHERE class = ? "
+                f"AND {expression} IN ({', '.join('?' * len(page))})",
+                [class_name] + page).fetchall()
+            for (key, _id) in rows:
+                obj = self.get(key)
+                if obj is not None:
+                    result[_id].append(obj)
+        return result
+
+    def __db(self):
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.__file_path)
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS objects "
+                "(key TEXT PRIMARY KEY, class TEXT, data TEXT)")
+        return self.__connection
+
+    def __insert(self, key, obj, data):
+        """caches obj, data is its stored JSON or None if it changed"""
+        size = len(data if data is not None else json.dumps(obj.to_dict()))
+        self.__cache[key] = obj
+        self.__snapshots[key] = data
+        self.__sizes[key] = size
+        self.__bytes += size
+        self.__trim()
+
+    def __trim(self):
+        while len(self.__cache) > 1 and (
+                len(self.__cache) > self.max_objects or
+                (self.max_bytes is not None and
+                 self.__bytes > self.max_bytes)):
+            (old, _) = next(iter(self.__cache.items()))
+            self.__write(old)
+            self.__discard(old)
+            self.evictions += 1
+
+    def __discard(self, key):
+        obj = self.__cache.pop(key, None)
+        self.__snapshots.pop(key, None)
+        self.__bytes -= self.__sizes.pop(key, 0)
+        return obj
+
+    def __write(self, key):
+        """writes a cached object back if it changed since it was read"""
+        obj = self.__cache[key]
+        data = json.dumps(obj.to_dict())
+        if data == self.__snapshots[key]:
+            return
+        self.__db().execute(
+            "INSERT OR REPLACE INTO objects (key, class, data) "
+            "VALUES (?, ?, ?)", (key, obj.__class__.__name__, data))
+        self.__bytes += len(data) - self.__sizes[key]
+        self.__sizes[key] = len(data)
+        self.__snapshots[key] = data
+
+    def __flush(self):
+        for key in list(self.__cache):
+            self.__write(key)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""A module that defines a change log shared by storage processes"""
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+
+
+class ChangeFeed():
+    """Append-only, sequence-numbered log of stored object changes
+
+    Writers append one JSON line per changed object while holding a lock
+    on the log. Readers tail the log from their last offset, so catching
+    up costs only the size of the changes. When the log grows past its
+    limit it is replaced by an empty one and readers reload the snapshot.
+
+    Attributes:
+        path (str): The path of the log file.
+        seq (int): The sequence number of the last entry seen.
+    """
+    __limit = 1 << 20
+
+    def __init__(self, path):
+        self.path = path
+        self.seq = 0
+        self.__inode = None
+        self.__offset = 0
+
+    def mark(self):
+        """starts following the log from its current end"""
+        self.__touch()
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.__inode = stat.st_ino
+            self.__offset = stat.st_size
+            self.seq = max(self.seq, self.__last_seq(f))
+
+    def read(self):
+        """returns the entries appended since the last read, or None if
+        the log was replaced and the snapshot must be reloaded"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if stat.st_ino != self.__inode or stat.st_size < self.__offset:
+            return None
+        if stat.st_size == self.__offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.__offset)
+            data = f.read(stat.st_size - self.__offset)
+        end = data.rfind(b"\n") + 1
+        self.__offset += end
+        entries = []
+        for line in data[:end].splitlines():
+            entry = json.loads(line)
+            if entry["seq"] > self.seq:
+                self.seq = entry["seq"]
+                entries.append(entry)
+        return entries
+
+    @contextmanager
+    def lock(self):
+        """holds the writer lock of the log"""
+        self.__touch()
+        while True:
+            with open(self.path, "ab") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                if os.fstat(f.fileno()).st_ino == os.stat(self.path).st_ino:
+                    yield
+                    return
+
+    def append(self, changes):
+        """logs (op, key, value) changes, the writer lock must be held"""
+        lines = []
+        for (op, key, value) in changes:
+            self.seq += 1
+            lines.append(json.dumps(
+                {"seq": self.seq, "op": op, "key": key, "value": value}))
+        if len(lines) == 0:
+            return
+        with open(self.path, "ab") as f:
+            f.write(("\n".join(lines) + "\n").encode())
+            size = f.tell()
+        self.__offset = size
+        if size > ChangeFeed.__limit:
+            self.__rotate()
+
+    def __rotate(self):
+        """replaces the log by one holding only the current sequence"""
+        temp = self.path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write((json.dumps({"seq": self.seq, "op": "rotate",
+                                 "key": None, "value": None}) + "\n").encode())
+        os.replace(temp, self.path)
+        self.mark()
+
+    def __touch(self):
+        if not os.path.exists(self.path):
+            with open(self.path, "ab"):
+                pass
+
+    def __last_seq(self, f):
+        size = os.fstat(f.fileno()).st_size
+        f.seek(max(0, size - 4096))
+        lines = f.read().splitlines()
+        for line in reversed(lines):
+            try:
+                return json.loads(line)["seq"]
+            except (ValueError, KeyError):
+                continue
+        return 0
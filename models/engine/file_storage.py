@@ -1,57 +1,270 @@
 #!/usr/bin/env python3
 """A module that defines the storage class"""
+import importlib
 import json
+import os
 from typing import Dict
 
 
+class _ClassMap(dict):
+    """model classes keyed by name, each module imported on first lookup"""
+    __modules = {
+        'BaseModel': 'base_model',
+        'City': 'city',
+        'Place': 'place',
+        'State': 'state',
+        'User': 'user',
+        'Amenity': 'amenity',
+        'Review': 'review'
+    }
+
+    def __missing__(self, name):
+        module = importlib.import_module(
+            'models.' + _ClassMap.__modules[name])
+        self[name] = getattr(module, name)
+        return self[name]
+
+
+_class_map = _ClassMap()
+
+
+def classes():
+    """returns the model classes keyed by their name"""
+    return _class_map
+
+
 class FileStorage():
     """File storage class"""
     __file_path = "file.json"
     __objects: Dict[str, object] = {}
+    __references: Dict[tuple, Dict[str, dict]] = {}
+    __persisted: Dict[str, dict] = {}
+    __feed = None
+    __loaded = False
 
     def all(self):
         """returns list of data"""
+        self.__load_once()
+        self.refresh()
         return FileStorage.__objects
 
+    def follow(self, feed):
+        """shares saved changes with other processes through a ChangeFeed"""
+        FileStorage.__feed = feed
+
     def new(self, obj):
         """adds new data to the list"""
-        key = f"{obj.__class__.__name__}.{obj.id}"
+        self.__load_once()
+        class_name = obj.__class__.__name__
+        key = f"{class_name}.{obj.id}"
         FileStorage.__objects[key] = obj
+        for ((name, attr), index) in FileStorage.__references.items():
+            if name == class_name:
+                index.setdefault(getattr(obj, attr, None), {})[key] = None
+
+    def reindex(self, obj, attr, old, value):
+        """moves a stored object to its new value in the index of attr"""
+        index = FileStorage.__references.get((obj.__class__.__name__, attr))
+        if index is None or old == value:
+            return
+        key = f"{obj.__class__.__name__}.{getattr(obj, 'id', None)}"
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        index.get(old, {}).pop(key, None)
+        index.setdefault(value, {})[key] = None
+
+    def attach(self, obj):
+        """nothing to do, stored objects always stay in memory"""
 
     def save(self):
         """saves data to fille storage"""
-        with open(FileStorage.__file_path, 'w') as f:
-            temp = {}
-            temp.update(FileStorage.__objects)
+        self.__load_once()
+        feed = FileStorage.__feed
+        if feed is None:
+            self.__write(self.__snapshot())
+            self.__prune()
+            return
+        with feed.lock():
+            self.refresh()
+            temp = self.__snapshot()
+            persisted = FileStorage.__persisted
+            changes = [("put", key, value) for (key, value) in temp.items()
+                       if persisted.get(key) != value]
+            changes += [("delete", key, None) for key in persisted
+                        if key not in temp]
+            self.__write(temp)
+            feed.append(changes)
+            FileStorage.__persisted = temp
+        self.__prune()
+
+    def refresh(self):
+        """applies the changes other processes saved since the last call"""
+        feed = FileStorage.__feed
+        if feed is None:
+            return
+        entries = feed.read()
+        if entries is None:
+            self.__reload_keeping_local()
+        elif len(entries) > 0:
+            self.__apply(entries)
+
+    def __reload_keeping_local(self):
+        """reloads the objects, keeping the ones created, changed or
+        deleted locally since they were last saved"""
+        objects = FileStorage.__objects
+        persisted = FileStorage.__persisted
+        local = {key: obj for (key, obj) in objects.items()
+                 if key not in persisted or obj.to_dict() != persisted[key]}
+        deleted = [key for key in persisted if key not in objects]
+        objects.clear()
+        self.reload()
+        objects.update(local)
+        for key in deleted:
+            objects.pop(key, None)
+
+    def __apply(self, entries):
+        """applies logged changes, keeping objects changed locally"""
+        class_map = classes()
+        objects = FileStorage.__objects
+        persisted = FileStorage.__persisted
+        for entry in entries:
+            key = entry["key"]
+            if key in persisted and (
+                    key not in objects or
+                    objects[key].to_dict() != persisted[key]):
+                continue
+            if entry["op"] == "put":
+                value = entry["value"]
+                clazz = class_map[value["__class__"]]
+                clazz.coerce_batch([value])
+                objects[key] = clazz(**value)
+                persisted[key] = value
+            elif entry["op"] == "delete":
+                objects.pop(key, None)
+                persisted.pop(key, None)
+        FileStorage.__references.clear()
 
-            for i in temp:
-                temp[i] = temp[i].to_dict()
+    def __snapshot(self):
+        temp = {}
+        temp.update(FileStorage.__objects)
+
+        for i in temp:
+            temp[i] = temp[i].to_dict()
+        return temp
+
+    def __write(self, temp):
+        """replaces the file at once so readers never see it half written"""
+        path = FileStorage.__file_path + ".tmp"
+        with open(path, 'w') as f:
             json.dump(temp, f)
+        os.replace(path, FileStorage.__file_path)
+
+    def related(self, class_name, attr, _id):
+        """returns objects of class_name whose attr references _id"""
+        return self.prefetch([_id], class_name, attr)[_id]
+
+    def prefetch(self, parents, class_name, attr):
+        """maps each parent (an object or id) to the objects of class_name
+        whose attr references it, resolving all of them in one pass"""
+        self.__load_once()
+        index = self.__index(class_name, attr)
+        result = {}
+        for parent in parents:
+            _id = getattr(parent, "id", parent)
+            result[_id] = [obj for obj in
+                           (FileStorage.__objects.get(key)
+                            for key in index.get(_id, ()))
+                           if obj is not None
+                           and getattr(obj, attr, None) == _id]
+        return result
+
+    def __index(self, class_name, attr):
+        """returns the reverse index of attr for class_name
+
+        The index is built on first use, then kept up to date by new,
+        reindex and save, and dropped when objects are reloaded.
+        """
+        index = FileStorage.__references.get((class_name, attr))
+        if index is None:
+            index = {}
+            for (key, obj) in FileStorage.__objects.items():
+                if obj.__class__.__name__ == class_name:
+                    index.setdefault(getattr(obj, attr, None), {})[key] = None
+            FileStorage.__references[(class_name, attr)] = index
+        return index
+
+    def __prune(self):
+        """drops index entries of removed or replaced objects"""
+        objects = FileStorage.__objects
+        for ((_, attr), index) in FileStorage.__references.items():
+            for (value, keys) in list(index.items()):
+                for key in [key for key in keys if key not in objects or
+                            getattr(objects[key], attr, None) != value]:
+                    del keys[key]
+                    if key in objects:
+                        index.setdefault(getattr(objects[key], attr, None),
+                                         {})[key] = None
+                if len(keys) == 0:
+                    index.pop(value, None)
 
     def reload(self):
-        """reloads previously stored data to the list of objects"""
-        from models.base_model import BaseModel
-        from models.city import City
-        from models.place import Place
-        from models.state import State
-        from models.user import User
-        from models.amenity import Amenity
-        from models.review import Review
-
-        class_map = {
-            'BaseModel': BaseModel,
-            'City': City,
-            'Place': Place,
-            'State': State,
-            'User': User,
-            'Amenity': Amenity,
-            'Review': Review
-        }
+        """reloads previously stored data to the list of objects
+
+        The stored dictionaries are only kept, to tell local changes from
+        logged ones, when following a change feed.
+        """
+        FileStorage.__loaded = True
+        FileStorage.__references.clear()
+        FileStorage.__persisted = {}
+        feed = FileStorage.__feed
+        if feed is not None:
+            feed.mark()
         try:
             with open(self.__file_path, 'r') as f:
                 result = json.load(f)
-                for (key, value) in result.items():
-                    FileStorage.__objects[key] = class_map[value["__class__"]](
-                        **value)
+                if feed is not None:
+                    FileStorage.__persisted = result
+                self.__load(result)
         except FileNotFoundError:
             pass
+
+    def snapshot(self, path, codec="gzip", level=None, base=None):
+        """writes the objects to a compressed snapshot file
+
+        Args:
+            path (str): The snapshot file to write.
+            codec (str): One of "gzip", "lzma", "zlib" or "none".
+            level (int): The compression level, the codec default if None.
+            base (str): A full snapshot; only objects changed since it
+            are written when given.
+        """
+        from models.engine import snapshot
+        snapshot.dump(self.all(), path, codec, level, base)
+
+    def restore(self, paths):
+        """replaces the objects by the ones in a full snapshot followed by
+        differential snapshots, then saves them"""
+        from models.engine import snapshot
+        result = snapshot.load(paths)
+        FileStorage.__loaded = True
+        FileStorage.__objects.clear()
+        self.__load(result)
+        self.save()
+
+    def __load_once(self):
+        """reloads the stored data on first use"""
+        if not FileStorage.__loaded:
+            self.reload()
+
+    def __load(self, result):
+        """hydrates stored dictionaries into objects, a class at a time"""
+        class_map = classes()
+        batches = {}
+        for (key, value) in result.items():
+            batches.setdefault(value["__class__"], []).append((key, value))
+        for (name, records) in batches.items():
+            clazz = class_map[name]
+            clazz.coerce_batch([value for (_, value) in records])
+            for (key, value) in records:
+                FileStorage.__objects[key] = clazz(**value)
+        FileStorage.__references.clear()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""A module that writes and restores compressed storage snapshots
+
+A snapshot is a stream of JSON lines: a header followed by one change
+per object. A full snapshot holds every object. A differential snapshot
+holds the objects updated since a full base snapshot, and the deletions
+since then.
+
+Usage:
+    python3 -m models.engine.snapshot dump [--codec C] [--level N]
+        [--base FULL] PATH
+    python3 -m models.engine.snapshot restore FULL [DIFF ...]
+"""
+import argparse
+import gzip
+import json
+import lzma
+import zlib
+from datetime import datetime
+
+CODECS = ("gzip", "lzma", "zlib", "none")
+_CHUNK_SIZE = 1 << 16
+
+
+class _ZlibWriter():
+    """binary file writing a zlib stream"""
+
+    def __init__(self, path, level):
+        self.__file = open(path, "wb")
+        self.__compressor = zlib.compressobj(level)
+
+    def write(self, data):
+        self.__file.write(self.__compressor.compress(data))
+
+    def close(self):
+        self.__file.write(self.__compressor.flush())
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _open_writer(path, codec, level):
+    if codec == "gzip":
+        return gzip.open(path, "wb", 9 if level is None else level)
+    if codec == "lzma":
+        return lzma.open(path, "wb", preset=level)
+    if codec == "zlib":
+        return _ZlibWriter(path, -1 if level is None else level)
+    if codec == "none":
+        return open(path, "wb")
+    raise ValueError(f"unknown codec: {codec}")
+
+
+def _read_zlib(path):
+    decompressor = zlib.decompressobj()
+    rest = b""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            lines = (rest + decompressor.decompress(chunk)).split(b"\n")
+            rest = lines.pop()
+            yield from lines
+    rest += decompressor.flush()
+    if rest:
+        yield rest
+
+
+def _read_lines(path):
+    """yields the JSON lines of a snapshot, whatever its codec"""
+    with open(path, "rb") as f:
+        magic = f.read(6)
+    if magic.startswith(b"\x1f\x8b"):
+        opener = gzip.open
+    elif magic.startswith(b"\xfd7zXZ\x00"):
+        opener = lzma.open
+    elif magic.startswith(b"\x78"):
+        yield from _read_zlib(path)
+        return
+    else:
+        opener = open
+    with opener(path, "rb") as f:
+        yield from f
+
+
+def _read(path):
+    """returns the header of a snapshot and an iterator of its changes"""
+    lines = (json.loads(line) for line in _read_lines(path) if line.strip())
+    header = next(lines, None)
+    if header is None or header.get("type") not in ("full", "diff"):
+        raise ValueError(f"{path} is not a snapshot")
+    return (header, lines)
+
+
+def dump(objects, path, codec="gzip", level=None, base=None):
+    """writes objects to a snapshot, a differential one if base is given
+
+    Args:
+        objects (dict): The stored objects keyed by "<class>.<id>".
+        path (str): The snapshot file to write.
+        codec (str): One of CODECS.
+        level (int): The compression level, the codec default if None.
+        base (str): The full snapshot a differential one is based on.
+    """
+    header = {"type": "full", "created_at": datetime.now().isoformat(),
+              "base": None}
+    base_keys = None
+    if base is not None:
+        (base_header, changes) = _read(base)
+        if base_header["type"] != "full":
+            raise ValueError(f"{base} is not a full snapshot")
+        base_keys = {change["key"] for change in changes}
+        since = datetime.fromisoformat(base_header["created_at"])
+        header["type"] = "diff"
+        header["base"] = base_header["created_at"]
+    with _open_writer(path, codec, level) as f:
+        buffer = [json.dumps(header)]
+        size = 0
+        live = set()
+        for (key, obj) in objects.items():
+            live.add(key)
+            if (base_keys is None or key not in base_keys or
+                    obj.updated_at > since):
+                line = json.dumps({"op": "put", "key": key,
+                                   "value": obj.to_dict()})
+                buffer.append(line)
+                size += len(line)
+                if size > _CHUNK_SIZE:
+                    f.write(("\n".join(buffer) + "\n").encode())
+                    (buffer, size) = ([], 0)
+        if base_keys is not None:
+            buffer += [json.dumps({"op": "delete", "key": key})
+                       for key in base_keys - live]
+        if len(buffer) > 0:
+            f.write(("\n".join(buffer) + "\n").encode())
+
+
+def load(paths):
+    """returns the stored dictionaries of a full snapshot followed by
+    differential snapshots taken against it"""
+    result = {}
+    created_at = None
+    for path in paths:
+        (header, changes) = _read(path)
+        if created_at is None and header["type"] != "full":
+            raise ValueError(f"{path} is not a full snapshot")
+        if created_at is not None and header["base"] != created_at:
+            raise ValueError(f"{path} is not based on {paths[0]}")
+        created_at = created_at or header["created_at"]
+        for change in changes:
+            if change["op"] == "put":
+                result[change["key"]] = change["value"]
+            else:
+                result.pop(change["key"], None)
+    return result
+
+
+def main(argv=None):
+    """dumps the storage to a snapshot or restores it from snapshots"""
+    parser = argparse.ArgumentParser(
+        prog="python3 -m models.engine.snapshot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    _dump = commands.add_parser("dump", help="write a snapshot")
+    _dump.add_argument("--codec", choices=CODECS, default="gzip")
+    _dump.add_argument("--level", type=int)
+    _dump.add_argument("--base", help="full snapshot to diff against")
+    _dump.add_argument("path")
+    _restore = commands.add_parser("restore", help="restore snapshots")
+    _restore.add_argument("paths", nargs="+",
+                          help="a full snapshot then differential ones")
+    args = parser.parse_args(argv)
+
+    from models import storage
+    try:
+        if args.command == "dump":
+            storage.snapshot(args.path, args.codec, args.level, args.base)
+        else:
+            storage.restore(args.paths)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Module that defines a class `Amenity`"""
 
+from models import storage
 from models.base_model import BaseModel
 
 
@@ -12,8 +13,21 @@ class Place(BaseModel):
     description = ""
     number_rooms = 0
     number_bathrooms = 0
-    max_guest: 0
+    max_guest = 0
     price_by_night = 0
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    @property
+    def reviews(self):
+        """returns the reviews of this place"""
+        return storage.related("Review", "place_id", self.id)
+
+    @property
+    def amenities(self):
+        """returns the amenities listed in amenity_ids"""
+        objects = storage.all()
+        return [objects[key] for key in
+                ("Amenity." + _id for _id in self.amenity_ids)
+                if key in objects]
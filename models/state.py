@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 """Module that defines a class `State`"""
+from models import storage
 from models.base_model import BaseModel
 
 
 class State(BaseModel):
     """State class inheriting from the Base Model"""
     name = ""
+
+    @property
+    def cities(self):
+        """returns the cities in this state"""
+        return storage.related("City", "state_id", self.id)
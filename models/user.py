@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+from models import storage
 from models.base_model import BaseModel
 """Module that defines a class `User`"""
 
@@ -10,3 +11,13 @@ class User(BaseModel):
     password = ""
     first_name = ""
     last_name = ""
+
+    @property
+    def places(self):
+        """returns the places owned by this user"""
+        return storage.related("Place", "user_id", self.id)
+
+    @property
+    def reviews(self):
+        """returns the reviews written by this user"""
+        return storage.related("Review", "user_id", self.id)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Cached Storage testing module"""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from models.engine.cached_storage import CachedStorage
+from models.city import City
+from models.place import Place
+from models.state import State
+
+_PATH = "test_cache.db"
+
+
+class TestCachedStorage(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists(_PATH):
+            os.remove(_PATH)
+        self.storage = CachedStorage(_PATH, max_objects=2)
+
+    def tearDown(self):
+        for path in (_PATH, _PATH + ".full", _PATH + ".diff"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def add(self, obj):
+        self.storage.new(obj)
+        return f"{obj.__class__.__name__}.{obj.id}"
+
+    def test_cache_is_bounded(self):
+        """Test that no more than max_objects stay in memory"""
+        for _ in range(5):
+            self.add(State())
+        self.assertEqual(2, self.storage.stats()["objects"])
+        self.assertEqual(3, self.storage.evictions)
+        self.assertEqual(5, len(self.storage.all()))
+
+    def test_dirty_entries_written_on_eviction(self):
+        """Test that an evicted object is read back from disk"""
+        state = State()
+        state.name = "Lagos"
+        key = self.add(state)
+        self.add(State())
+        self.add(State())
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual("Lagos", self.storage.all()[key].name)
+        self.assertEqual(1, self.storage.misses)
+        self.storage.all()[key]
+        self.assertEqual(1, self.storage.hits)
+
+    def test_changes_persist_after_reload(self):
+        """Test that a modified cached object is saved"""
+        place = Place()
+        key = self.add(place)
+        self.storage.save()
+        self.storage.all()[key].number_rooms = 3
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(3, self.storage.all()[key].number_rooms)
+
+    def test_delete(self):
+        """Test that deleted objects are gone from disk"""
+        key = self.add(State())
+        self.storage.save()
+        self.storage.all().pop(key)
+        self.storage.save()
+        self.assertIsNone(self.storage.all().get(key))
+        self.assertEqual(0, len(self.storage.all()))
+
+    def test_prefetch(self):
+        """Test that prefetch resolves children from disk"""
+        state = State()
+        self.add(state)
+        cities = []
+        for _ in range(3):
+            city = City()
+            city.state_id = state.id
+            self.add(city)
+            cities.append(city.id)
+        result = self.storage.prefetch([state, "none"], "City", "state_id")
+        self.assertEqual(sorted(cities),
+                         sorted(c.id for c in result[state.id]))
+        self.assertEqual([], result["none"])
+
+    def test_byte_bound(self):
+        """Test that max_bytes bounds the serialized size in memory"""
+        storage = CachedStorage(_PATH, max_objects=100, max_bytes=1)
+        for _ in range(3):
+            storage.new(State())
+        storage.save()
+        self.assertEqual(1, storage.stats()["objects"])
+
+    def test_byte_bound_counts_new_objects(self):
+        """Test that unsaved objects count toward max_bytes"""
+        storage = CachedStorage(_PATH, max_objects=10000, max_bytes=1000)
+        for _ in range(2000):
+            storage.new(State())
+        stats = storage.stats()
+        self.assertLess(stats["objects"], 2000)
+        self.assertGreater(stats["bytes"], 0)
+        self.assertLessEqual(stats["bytes"], 1000)
+        self.assertEqual(2000, len(storage.all()))
+
+    def test_attach_skips_deleted(self):
+        """Test that attaching a deleted object does not store it again"""
+        state = State()
+        key = self.add(state)
+        self.storage.save()
+        self.storage.all().pop(key)
+        self.storage.attach(state)
+        self.storage.save()
+        self.assertIsNone(self.storage.all().get(key))
+
+    def test_save_evicted_object(self):
+        """Test that saving an object evicted from the cache writes it"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = ('from models import storage\n'
+                'from models.state import State\n'
+                's = State()\ns.name = "A"\ns.save()\n'
+                'for _ in range(5):\n    State().save()\n'
+                's.name = "B"\ns.save()\nstorage.reload()\n'
+                'print(storage.all()["State." + s.id].name)\n')
+        env = dict(os.environ, PYTHONPATH=root, HBNB_STORAGE="cache",
+                   HBNB_CACHE_SIZE="2")
+        with tempfile.TemporaryDirectory() as cwd:
+            out = subprocess.run([sys.executable, "-c", code], cwd=cwd,
+                                 env=env, check=True, capture_output=True,
+                                 text=True).stdout.strip()
+        self.assertEqual("B", out)
+
+    def test_differential_snapshot_reads_each_object_once(self):
+        """Test that deletions are found without a lookup per base key"""
+        keys = [self.add(State()) for _ in range(6)]
+        self.storage.save()
+        self.storage.snapshot(_PATH + ".full", "zlib")
+        self.storage.all().pop(keys[0])
+        misses = self.storage.misses
+        self.storage.snapshot(_PATH + ".diff", "zlib", base=_PATH + ".full")
+        self.assertEqual(misses + 5, self.storage.misses)
+        from models.engine import snapshot
+        result = snapshot.load([_PATH + ".full", _PATH + ".diff"])
+        self.assertEqual(set(keys[1:]), set(result))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Change Feed testing module"""
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+from models.engine.change_feed import ChangeFeed
+from models.engine.file_storage import FileStorage
+
+_LOG = "test_feed.log"
+
+
+def run(code):
+    """runs code in another process following the change feed"""
+    env = dict(os.environ, HBNB_CHANGE_FEED="1")
+    env.pop("HBNB_STORAGE", None)
+    return subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+class TestChangeFeed(unittest.TestCase):
+    def setUp(self):
+        self.tearDown()
+
+    def tearDown(self):
+        for path in (_LOG, _LOG + ".tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_read_appended(self):
+        """Test that a reader only sees entries after its mark"""
+        writer = ChangeFeed(_LOG)
+        reader = ChangeFeed(_LOG)
+        with writer.lock():
+            writer.append([("put", "State.1", {"id": "1"})])
+        reader.mark()
+        self.assertEqual([], reader.read())
+        with writer.lock():
+            writer.append([("delete", "State.1", None),
+                           ("put", "State.2", {"id": "2"})])
+        entries = reader.read()
+        self.assertEqual([2, 3], [entry["seq"] for entry in entries])
+        self.assertEqual(["delete", "put"], [e["op"] for e in entries])
+        self.assertEqual(3, reader.seq)
+
+    def test_rotation_requires_reload(self):
+        """Test that a replaced log is reported to readers"""
+        writer = ChangeFeed(_LOG)
+        reader = ChangeFeed(_LOG)
+        reader.mark()
+        with patch.object(ChangeFeed, "_ChangeFeed__limit", 1):
+            with writer.lock():
+                writer.append([("put", "State.1", {"id": "1"})])
+        self.assertIsNone(reader.read())
+        reader.mark()
+        self.assertEqual(1, reader.seq)
+        with writer.lock():
+            writer.append([("put", "State.2", {"id": "2"})])
+        self.assertEqual([2], [entry["seq"] for entry in reader.read()])
+
+
+class TestFileStorageFeed(unittest.TestCase):
+    def setUp(self):
+        self.paths = [FileStorage._FileStorage__file_path, "file.json.log"]
+        self.tearDown()
+        self.storage = FileStorage()
+        self.storage.follow(ChangeFeed("file.json.log"))
+        self.storage.reload()
+
+    def tearDown(self):
+        FileStorage._FileStorage__feed = None
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_changes_from_other_process(self):
+        """Test that saves by another process are applied incrementally"""
+        _id = run("from models.state import State\n"
+                  "s = State()\ns.name = 'Lagos'\ns.save()\nprint(s.id)")
+        state = self.storage.all().get("State." + _id)
+        self.assertIsNotNone(state)
+        self.assertEqual("Lagos", state.name)
+
+        run("from models import storage\n"
+            f"storage.all()['State.{_id}'].name = 'Abuja'\n"
+            "storage.save()")
+        self.assertEqual("Abuja", self.storage.all()["State." + _id].name)
+
+        run("from models import storage\n"
+            f"storage.all().pop('State.{_id}')\n"
+            "storage.save()")
+        self.assertNotIn("State." + _id, self.storage.all())
+
+    def test_rotation_keeps_unsaved_objects(self):
+        """Test that a rotated log does not drop local unsaved objects"""
+        from models.state import State
+        mine = State()
+        mine.name = "Kano"
+        _id = run("from models.engine.change_feed import ChangeFeed\n"
+                  "ChangeFeed._ChangeFeed__limit = 1\n"
+                  "from models.state import State\n"
+                  "s = State()\ns.save()\nprint(s.id)")
+        mine.save()
+        objects = self.storage.all()
+        self.assertIs(mine, objects.get("State." + mine.id))
+        self.assertIn("State." + _id, objects)
+        self.assertEqual("Kano", run(
+            "from models import storage\n"
+            f"print(storage.all()['State.{mine.id}'].name)"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 
 from io import StringIO
+import json
 import os
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
 from unittest.mock import patch
 
@@ -79,6 +84,222 @@ class TestHBNBService(unittest.TestCase):
         self.assertIsNone(self.service.fetch_model_by_id('User', id1))
         self.assertEqual('** no instance found **', f.getvalue().strip())
 
+    def test_update_casts_declared_type(self):
+        _id = self.service.create('Place')
+        place = self.service.update_model_attribute('Place', _id,
+                                                    'number_rooms', '3')
+        self.assertEqual(3, place.number_rooms)
+        place = self.service.update_model_attribute('Place', _id,
+                                                    'price_by_night', 120)
+        self.assertEqual(120, place.price_by_night)
+
+    def test_update_command_strips_quotes(self):
+        console = HBNBCommand()
+        _id = self.service.create('Place')
+        with patch('sys.stdout', new=StringIO()):
+            console.onecmd('update Place {} number_rooms "3"'.format(_id))
+            console.onecmd('update Place {} name "Betty"'.format(_id))
+        place = self.service.fetch_model_by_id('Place', _id)
+        self.assertEqual(3, place.number_rooms)
+        self.assertEqual('Betty', place.name)
+
+    @patch(target='sys.stdout', new_callable=StringIO)
+    def test_update_rejects_invalid_type(self, f: StringIO):
+        _id = self.service.create('Place')
+        self.assertIsNone(self.service.update_model_attribute(
+            'Place', _id, 'latitude', 'north'))
+        self.assertEqual('** invalid value **', f.getvalue().strip())
+
+
+class TestCommandParser(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _path = 'file.json'
+        if os.path.exists(_path):
+            os.remove(_path)
+
+    def tearDown(self) -> None:
+        _path = 'file.json'
+        if os.path.exists(_path):
+            os.remove(_path)
+
+    def test_dot_syntax_is_dispatched(self):
+        console = HBNBCommand()
+        with patch('sys.stdout', new=StringIO()) as f:
+            _id = console.bnbService.create('User')
+            clear_buffer(f)
+            console.onecmd('User.show("{}")'.format(_id))
+            self.assertIn('[User] ({})'.format(_id), f.getvalue())
+
+    def test_unknown_method(self):
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd('User.foo()')
+            self.assertEqual('*** Unknown syntax: User.foo()',
+                             f.getvalue().strip())
+
+    def test_quoted_argument_keeps_commas(self):
+        tokens = HBNBCommand().tokenize_string(
+            'User.update("1234", "name", "a, b")')
+        self.assertEqual(['User', 'update', '1234', 'name', 'a, b'], tokens)
+
+    def test_quoted_value_is_stored_whole(self):
+        console = HBNBCommand()
+        with patch('sys.stdout', new=StringIO()):
+            _id = console.bnbService.create('Place')
+            console.onecmd('Place.update("{}", "name", "Cosy flat, centre")'
+                           .format(_id))
+        place = console.bnbService.fetch_model_by_id('Place', _id)
+        self.assertEqual('Cosy flat, centre', place.name)
+
+    def test_dict_argument(self):
+        tokens = HBNBCommand().tokenize_string(
+            'User.update("1234", {"a": 1, "b": 2})')
+        self.assertEqual(['User', 'update', '1234', {'a': 1, 'b': 2}],
+                         tokens)
+
+    def test_protected_attributes_are_rejected(self):
+        console = HBNBCommand()
+        with patch('sys.stdout', new=StringIO()) as f:
+            _id = console.bnbService.create('User')
+            for attrs in ('{"id": "hijack"}', '{"created_at": "x"}',
+                          '{"updated_at": "x"}', '{"__class__": "Place"}'):
+                clear_buffer(f)
+                console.onecmd('User.update("{}", {})'.format(_id, attrs))
+                self.assertEqual("** attribute can't be updated **",
+                                 f.getvalue().strip())
+        user = console.bnbService.fetch_model_by_id('User', _id)
+        self.assertEqual(_id, user.id)
+        user.save()
+
+    def test_relationships_are_rejected(self):
+        console = HBNBCommand()
+        with patch('sys.stdout', new=StringIO()) as f:
+            _id = console.bnbService.create('Place')
+            for line in ('update Place {} reviews x',
+                         'Place.update("{}", "amenities", "x")',
+                         'Place.update("{}", {{"reviews": []}})'):
+                clear_buffer(f)
+                console.onecmd(line.format(_id))
+                self.assertEqual("** attribute can't be updated **",
+                                 f.getvalue().strip())
+        place = console.bnbService.fetch_model_by_id('Place', _id)
+        self.assertEqual([], place.reviews)
+
+    def test_dict_update_saves_once(self):
+        console = HBNBCommand()
+        with patch('sys.stdout', new=StringIO()):
+            _id = console.bnbService.create('User')
+        with patch.object(console.bnbService.storage, 'save') as save, \
+                patch('sys.stdout', new=StringIO()):
+            console.onecmd(
+                'User.update("{}", {{"first_name": "Betty", '
+                '"last_name": "Bar"}})'.format(_id))
+        self.assertEqual(1, save.call_count)
+        user = console.bnbService.fetch_model_by_id('User', _id)
+        self.assertEqual('Betty', user.first_name)
+        self.assertEqual('Bar', user.last_name)
+
+    def test_unquoted_id_with_dict(self):
+        console = HBNBCommand()
+        with patch('sys.stdout', new=StringIO()):
+            _id = console.bnbService.create('Place')
+            console.onecmd('Place.update({}, {{"name": "a", '
+                           '"number_rooms": 2}})'.format(_id))
+        place = console.bnbService.fetch_model_by_id('Place', _id)
+        self.assertEqual('a', place.name)
+        self.assertEqual(2, place.number_rooms)
+        self.assertEqual(['id', 'created_at', 'updated_at', 'name',
+                          'number_rooms'], list(place.__dict__))
+
+    def test_split_dict_is_refused(self):
+        with patch('sys.stdout', new=StringIO()) as f:
+            HBNBCommand().onecmd('Place.update(abc, {"name": "a"')
+            self.assertIn('*** Unknown syntax', f.getvalue())
+
+    def test_dict_update_with_quoted_id(self):
+        console = HBNBCommand()
+        with patch('sys.stdout', new=StringIO()):
+            _id = console.bnbService.create('Place')
+            console.onecmd('update "Place" "{}" {{"name": "q"}}'.format(_id))
+        place = console.bnbService.fetch_model_by_id('Place', _id)
+        self.assertEqual('q', place.name)
+
+    def test_piped_script_throughput(self):
+        """Runs a large piped script through the command loop, the timing
+        is printed when HBNB_BENCHMARK is set"""
+        with patch('sys.stdout', new=StringIO()):
+            ids = [HBNBCommand.bnbService.create('User') for _ in range(100)]
+        lines = []
+        for i in range(20000):
+            _id = ids[i % len(ids)]
+            if i % 4 == 0:
+                lines.append('User.show("{}")'.format(_id))
+            elif i % 4 == 1:
+                lines.append('show User {}'.format(_id))
+            elif i % 4 == 2:
+                lines.append('User.count()')
+            else:
+                lines.append('User.foo("{}", {{"a": 1}})'.format(_id))
+        with patch('sys.stdout', new=StringIO()) as f:
+            console = HBNBCommand(stdin=StringIO('\n'.join(lines) + '\n'))
+            console.use_rawinput = False
+            console.prompt = ''
+            start = time.perf_counter()
+            console.cmdloop()
+            elapsed = time.perf_counter() - start
+        output = f.getvalue()
+        self.assertEqual(10000, output.count('[User] ('))
+        self.assertEqual(5000, output.count('*** Unknown syntax'))
+        if os.getenv('HBNB_BENCHMARK'):
+            print('\n{} lines in {:.3f}s, {:.0f} lines/s'.format(
+                len(lines), elapsed, len(lines) / elapsed))
+
+
+class TestStartup(unittest.TestCase):
+
+    def run_console(self, commands, size=20000):
+        """Runs commands in a fresh process over a file.json of size objects
+        and returns its output and import time report"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = ('import sys, console\n'
+                'from models.engine.file_storage import FileStorage\n'
+                'c = console.HBNBCommand()\n'
+                'for line in sys.argv[1:]:\n'
+                '    c.onecmd(c.precmd(line))\n'
+                'print(FileStorage._FileStorage__loaded,'
+                ' "models.place" in sys.modules)\n')
+        with tempfile.TemporaryDirectory() as cwd:
+            with open(os.path.join(cwd, 'file.json'), 'w') as f:
+                json.dump({'BaseModel.{}'.format(i): {
+                    'id': str(i), '__class__': 'BaseModel',
+                    'created_at': '2023-01-01T10:00:00',
+                    'updated_at': '2023-01-01T10:00:00'}
+                    for i in range(size)}, f)
+            env = dict(os.environ, PYTHONPATH=root)
+            for name in ('HBNB_STORAGE', 'HBNB_CHANGE_FEED'):
+                env.pop(name, None)
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', code] + commands,
+                cwd=cwd, env=env, capture_output=True, text=True, check=True)
+        return result.stdout.strip().splitlines(), result.stderr
+
+    def test_commands_without_data_skip_loading(self):
+        out, report = self.run_console(['help', 'create Foo', 'quit'])
+        self.assertEqual("** class doesn't exist **", out[-2])
+        self.assertEqual('False False', out[-1])
+        imports = [line.split('|') for line in report.splitlines()
+                   if line.startswith('import time:') and
+                   'cumulative' not in line]
+        if os.getenv('HBNB_BENCHMARK'):
+            slowest = sorted(imports, key=lambda x: -int(x[1]))[:5]
+            print('\n' + '\n'.join('|'.join(x) for x in slowest))
+        self.assertNotIn('models.base_model',
+                         [x[2].strip() for x in imports])
+
+    def test_data_commands_load_storage(self):
+        out, _ = self.run_console(['count BaseModel'], 10)
+        self.assertEqual(['10', 'True False'], out)
+
 
 class TestCommandDoc(unittest.TestCase):
 
@@ -4,6 +4,11 @@ import unittest
 import os
 from models.engine.file_storage import FileStorage
 from models.base_model import BaseModel  # Import your FileStorage class
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
 
 
 class TestFileStorage(unittest.TestCase):
@@ -41,6 +46,81 @@ class TestFileStorage(unittest.TestCase):
             tmp[key] = value.to_dict()
         self.assertIn(f"{b1.__class__.__name__}.{b1.id}", tmp)
 
+    def test_save_keeps_deleted_objects_out(self):
+        """Test that saving a destroyed object does not store it again"""
+        b1 = BaseModel()
+        key = f"{b1.__class__.__name__}.{b1.id}"
+        self.storage.all().pop(key)
+        b1.save()
+        self.assertNotIn(key, self.storage.all())
+
+    def test_reload_without_feed_keeps_no_copy(self):
+        """Test that the stored dictionaries are dropped without a feed"""
+        BaseModel().save()
+        self.storage.reload()
+        self.assertEqual({}, FileStorage._FileStorage__persisted)
+
+
+class TestRelationships(unittest.TestCase):
+    def setUp(self):
+        self.storage = FileStorage()
+        self.state = State()
+        self.city = City()
+        self.city.state_id = self.state.id
+        self.place = Place()
+        self.place.city_id = self.city.id
+        self.review = Review()
+        self.review.place_id = self.place.id
+        self.amenity = Amenity()
+        self.place.amenity_ids = [self.amenity.id, "missing"]
+
+    def tearDown(self):
+        if os.path.exists(FileStorage._FileStorage__file_path):
+            os.remove(FileStorage._FileStorage__file_path)
+
+    def test_accessors(self):
+        """Test the relationship properties of the models"""
+        self.assertEqual([self.city], self.state.cities)
+        self.assertEqual([self.place], self.city.places)
+        self.assertEqual([self.review], self.place.reviews)
+        self.assertEqual([self.amenity], self.place.amenities)
+
+    def test_prefetch(self):
+        """Test that prefetch resolves the children of every parent"""
+        other = State()
+        result = self.storage.prefetch([self.state, other], "City",
+                                       "state_id")
+        self.assertEqual({self.state.id: [self.city], other.id: []}, result)
+
+    def test_index_follows_changes(self):
+        """Test that a reassigned reference moves without a save"""
+        self.assertEqual([self.city], self.state.cities)
+        other = State()
+        self.city.state_id = other.id
+        self.assertEqual([], self.state.cities)
+        self.assertEqual([self.city], other.cities)
+        self.storage.save()
+        self.assertEqual([self.city], other.cities)
+
+    def test_index_follows_new_objects(self):
+        """Test that new objects are indexed without rebuilding"""
+        self.assertEqual([self.city], self.state.cities)
+        index = FileStorage._FileStorage__references[("City", "state_id")]
+        city = City()
+        city.state_id = self.state.id
+        self.assertIs(index, FileStorage._FileStorage__references[
+            ("City", "state_id")])
+        self.assertEqual([self.city, city], self.state.cities)
+
+    def test_index_drops_deleted_objects(self):
+        """Test that save prunes deleted objects from the index"""
+        self.assertEqual([self.city], self.state.cities)
+        self.storage.all().pop(f"City.{self.city.id}")
+        self.storage.save()
+        index = FileStorage._FileStorage__references[("City", "state_id")]
+        self.assertNotIn(self.state.id, index)
+        self.assertEqual([], self.state.cities)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@
 """BaseModel testing module"""
 import unittest
 from models.base_model import BaseModel
+from models.place import Place
 from datetime import datetime
 
 
@@ -72,5 +73,63 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(model_dict["__class__"], "BaseModel")
 
 
+class TestSchema(unittest.TestCase):
+    """A test case class for typed attribute coercion"""
+
+    def test_schema_from_class_attributes(self):
+        """Test that the schema follows the declared attribute types."""
+        schema = Place.schema()
+        for key in ("name", "number_rooms", "max_guest", "latitude",
+                    "amenity_ids"):
+            self.assertIn(key, schema)
+        self.assertIs(schema["number_rooms"], schema["max_guest"])
+        self.assertIsNot(schema["number_rooms"], schema["latitude"])
+        self.assertEqual({}, BaseModel.schema())
+
+    def test_coerce(self):
+        """Test that values are cast to the declared type."""
+        self.assertEqual(4, Place.coerce("number_rooms", "4"))
+        self.assertEqual(1.5, Place.coerce("latitude", "1.5"))
+        self.assertEqual(["a", "b"], Place.coerce("amenity_ids", "['a', 'b']"))
+        self.assertEqual("4", Place.coerce("undeclared", "4"))
+
+    def test_coerce_invalid(self):
+        """Test that a value of the wrong type is rejected."""
+        with self.assertRaises(ValueError):
+            Place.coerce("number_rooms", "four")
+
+    def test_coerce_is_strict(self):
+        """Test that casts which would lose data are refused."""
+        self.assertEqual(3, Place.coerce("max_guest", 3.0))
+        for value in (3.7, True, None, "3.5"):
+            with self.assertRaises(ValueError):
+                Place.coerce("max_guest", value)
+        with self.assertRaises(ValueError):
+            Place.coerce("latitude", False)
+        self.assertIsNone(Place.coerce("name", None))
+        self.assertEqual(5, Place.coerce("name", 5))
+
+    def test_coerce_batch_keeps_none(self):
+        """Test that loading keeps None and non-string values."""
+        records = [{"name": None, "number_rooms": None,
+                    "description": 12}]
+        Place.coerce_batch(records)
+        self.assertEqual([{"name": None, "number_rooms": None,
+                           "description": 12}], records)
+
+    def test_coerce_read_only(self):
+        """Test that the attributes managed by the model are refused."""
+        for key in ("id", "created_at", "updated_at", "__class__"):
+            with self.assertRaises(ValueError):
+                Place.coerce(key, "2023-01-01T10:00:00")
+
+    def test_coerce_batch(self):
+        """Test that a batch is cast in place and bad values are kept."""
+        records = [{"number_rooms": "2"}, {"number_rooms": "two"}]
+        Place.coerce_batch(records)
+        self.assertEqual([{"number_rooms": 2}, {"number_rooms": "two"}],
+                         records)
+
+
 if __name__ == "__main__":
     unittest.main()
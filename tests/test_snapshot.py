@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Snapshot testing module"""
+import os
+import time
+import unittest
+from datetime import datetime, timedelta
+from models.engine import snapshot
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+_PATHS = ["test_full.snap", "test_diff.snap"]
+
+
+def dataset(size):
+    """returns size realistic objects keyed like the storage"""
+    objects = {}
+    for i in range(size):
+        user = User(id=f"user-{i}", created_at="2023-01-01T10:00:00",
+                    updated_at="2023-01-01T10:00:00",
+                    email=f"user{i}@example.com", first_name="Betty",
+                    last_name=f"Holberton {i}")
+        place = Place(id=f"place-{i}", created_at="2023-01-01T10:00:00",
+                      updated_at="2023-01-01T10:00:00", user_id=user.id,
+                      city_id=f"city-{i % 50}", name=f"Cosy flat {i}",
+                      description="A quiet flat close to the old town, "
+                                  "with a balcony and a view on the river.",
+                      number_rooms=i % 5 + 1, price_by_night=40 + i % 200,
+                      latitude=37.77 + i / 1e4, longitude=-122.41 - i / 1e4,
+                      amenity_ids=[f"amenity-{i % 7}", f"amenity-{i % 3}"])
+        review = Review(id=f"review-{i}", created_at="2023-01-02T10:00:00",
+                        updated_at="2023-01-02T10:00:00", place_id=place.id,
+                        user_id=user.id, text="Great stay, would book again.")
+        for obj in (user, place, review):
+            objects[f"{obj.__class__.__name__}.{obj.id}"] = obj
+    return objects
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tearDown()
+        self.objects = dataset(20)
+
+    def tearDown(self):
+        for path in _PATHS:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_round_trip(self):
+        """Test that every codec restores the same objects"""
+        expected = {key: obj.to_dict() for (key, obj) in self.objects.items()}
+        for codec in snapshot.CODECS:
+            snapshot.dump(self.objects, _PATHS[0], codec)
+            self.assertEqual(expected, snapshot.load(_PATHS[:1]), codec)
+
+    def test_differential(self):
+        """Test that a differential snapshot holds only changes"""
+        snapshot.dump(self.objects, _PATHS[0], "zlib")
+        place = self.objects["Place.place-1"]
+        place.name = "Renovated flat"
+        place.updated_at = datetime.now() + timedelta(seconds=1)
+        del self.objects["Review.review-2"]
+        user = User()
+        self.objects[f"User.{user.id}"] = user
+        snapshot.dump(self.objects, _PATHS[1], "lzma", base=_PATHS[0])
+
+        (header, changes) = snapshot._read(_PATHS[1])
+        self.assertEqual("diff", header["type"])
+        self.assertEqual(3, len(list(changes)))
+
+        result = snapshot.load(_PATHS)
+        self.assertEqual(set(self.objects), set(result))
+        self.assertEqual("Renovated flat", result["Place.place-1"]["name"])
+
+    def test_differential_needs_its_base(self):
+        """Test that snapshots are only restored onto their base"""
+        snapshot.dump(self.objects, _PATHS[0])
+        with self.assertRaises(ValueError):
+            snapshot.load(_PATHS[:1] * 2)
+        snapshot.dump(self.objects, _PATHS[1], base=_PATHS[0])
+        with self.assertRaises(ValueError):
+            snapshot.dump(self.objects, _PATHS[0], base=_PATHS[1])
+
+    def test_codec_benchmark(self):
+        """Compares size and time of each codec on realistic data, the
+        report is printed when HBNB_BENCHMARK is set"""
+        objects = dataset(2000)
+        report = []
+        sizes = {}
+        for (codec, level) in [("none", None), ("zlib", 1), ("zlib", 6),
+                               ("gzip", 6), ("gzip", 9), ("lzma", 0),
+                               ("lzma", 6)]:
+            start = time.perf_counter()
+            snapshot.dump(objects, _PATHS[0], codec, level)
+            written = time.perf_counter() - start
+            start = time.perf_counter()
+            self.assertEqual(len(objects), len(snapshot.load(_PATHS[:1])))
+            read = time.perf_counter() - start
+            sizes[(codec, level)] = os.path.getsize(_PATHS[0])
+            report.append(f"{codec:>5} {str(level):>4} "
+                          f"{sizes[(codec, level)]:>10} "
+                          f"{written:8.3f}s {read:8.3f}s")
+        if os.getenv("HBNB_BENCHMARK"):
+            print("\ncodec level      bytes    write     read")
+            print("\n".join(report))
+        raw = sizes[("none", None)]
+        for (key, size) in sizes.items():
+            if key[0] != "none":
+                self.assertLess(size, raw / 3, key)
+
+
+if __name__ == '__main__':
+    unittest.main()